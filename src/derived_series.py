@@ -0,0 +1,473 @@
+"""``derived_series`` computes spreads and curve metrics lazily.
+
+Instead of adding derived columns to the DataFrame eagerly
+
+.. code:: python
+
+    data["2s10s"] = (data["us10y"] - data["us02y"]) * 100
+
+the derived series are declared once, as expressions,
+and only computed when a chart actually uses them:
+
+.. code:: python
+
+    from derived_series import DerivedFrame, col, spread, rolling_zscore
+
+    derived = DerivedFrame(
+        data,
+        s2s10s=spread("us10y", "us02y"),
+        z2s10s=rolling_zscore(col("s2s10s"), 60),
+    )
+    derived[["s2s10s", "us10y"]]  # z2s10s is never computed
+
+Each expression is evaluated in a single numpy pass, writing every
+operation in place into one output buffer, and the result is memoized
+in the ``DerivedFrame``. When new rows are appended with
+``DerivedFrame.append``, only the new rows are computed.
+
+Module Components
+-----------------
+"""
+
+from abc import ABC, abstractmethod
+from typing import Callable
+import numpy as np
+import pandas as pd
+
+Source = Callable[[str, int, int], np.ndarray]
+"""Function returning the rows ``[start, stop)`` of a column."""
+
+
+class Expr(ABC):
+    """Base class of the derived series expressions.
+
+    Expressions support the arithmetic operators (``+``, ``-``, ``*``,
+    ``/`` and unary ``-``) with other expressions and with numbers.
+    """
+
+    @abstractmethod
+    def evaluate(self, source: Source, start: int, stop: int, out: np.ndarray):
+        """Compute the rows ``[start, stop)`` of the expression into ``out``.
+
+        Parameters
+        ----------
+        source : Source
+            Function returning the rows of a column.
+        start : int
+            First row to compute.
+        stop : int
+            Row after the last row to compute.
+        out : np.ndarray
+            The output buffer, of length ``stop - start``.
+        """
+
+    @abstractmethod
+    def columns(self) -> set[str]:
+        """Return the names of the columns used by the expression."""
+
+    def __add__(self, other: "Expr | float") -> "Expr":
+        return BinOp(np.add, self, other)
+
+    def __radd__(self, other: float) -> "Expr":
+        return BinOp(np.add, other, self)
+
+    def __sub__(self, other: "Expr | float") -> "Expr":
+        return BinOp(np.subtract, self, other)
+
+    def __rsub__(self, other: float) -> "Expr":
+        return BinOp(np.subtract, other, self)
+
+    def __mul__(self, other: "Expr | float") -> "Expr":
+        return BinOp(np.multiply, self, other)
+
+    def __rmul__(self, other: float) -> "Expr":
+        return BinOp(np.multiply, other, self)
+
+    def __truediv__(self, other: "Expr | float") -> "Expr":
+        return BinOp(np.divide, self, other)
+
+    def __rtruediv__(self, other: float) -> "Expr":
+        return BinOp(np.divide, other, self)
+
+    def __neg__(self) -> "Expr":
+        return BinOp(np.multiply, -1.0, self)
+
+
+class Col(Expr):
+    """A column of the source DataFrame (or another derived series).
+
+    Parameters
+    ----------
+    name : str
+        Name of the column.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def evaluate(self, source: Source, start: int, stop: int, out: np.ndarray):
+        np.copyto(out, source(self.name, start, stop))
+
+    def columns(self) -> set[str]:
+        return {self.name}
+
+    def __repr__(self) -> str:
+        return f"col({self.name!r})"
+
+
+class BinOp(Expr):
+    """Element-wise binary operation between expressions or numbers.
+
+    Parameters
+    ----------
+    ufunc : np.ufunc
+        The numpy ufunc applying the operation (e.g. ``np.subtract``).
+    left : Expr | float
+        Left operand.
+    right : Expr | float
+        Right operand.
+    """
+
+    def __init__(self, ufunc: np.ufunc, left: Expr | float, right: Expr | float):
+        self.ufunc = ufunc
+        self.left = left
+        self.right = right
+
+    def evaluate(self, source: Source, start: int, stop: int, out: np.ndarray):
+        left, right = self.left, self.right
+
+        # columns and numbers are used directly, compound operands are
+        # computed in place into out, so a temporary buffer is only needed
+        # when both operands are compound
+        if _is_compound(left):
+            left.evaluate(source, start, stop, out)
+            if _is_compound(right):
+                tmp = np.empty_like(out)
+                right.evaluate(source, start, stop, tmp)
+                right = tmp
+            else:
+                right = _leaf(right, source, start, stop)
+            self.ufunc(out, right, out=out)
+        elif _is_compound(right):
+            right.evaluate(source, start, stop, out)
+            self.ufunc(_leaf(left, source, start, stop), out, out=out)
+        else:
+            self.ufunc(
+                _leaf(left, source, start, stop),
+                _leaf(right, source, start, stop),
+                out=out,
+            )
+
+    def columns(self) -> set[str]:
+        columns = set()
+        for operand in (self.left, self.right):
+            if isinstance(operand, Expr):
+                columns |= operand.columns()
+        return columns
+
+    def __repr__(self) -> str:
+        return f"{self.ufunc.__name__}({self.left!r}, {self.right!r})"
+
+
+class RollingZScore(Expr):
+    """Rolling z-score of an expression.
+
+    The z-score of each row is computed against the mean and sample standard
+    deviation of the last ``window`` rows (the row included), as
+    ``(x - x.rolling(window).mean()) / x.rolling(window).std()`` in pandas.
+    Rows whose window is incomplete or contains NaN are NaN.
+
+    Parameters
+    ----------
+    expr : Expr
+        The expression to standardise.
+    window : int
+        Number of rows of the rolling window. Must be at least 2.
+    """
+
+    def __init__(self, expr: Expr, window: int) -> None:
+        if window < 2:
+            raise Exception("the window must be at least 2 rows.")
+
+        self.expr = expr
+        self.window = window
+
+    def evaluate(self, source: Source, start: int, stop: int, out: np.ndarray):
+        w = self.window
+        lo = max(0, start - w + 1)
+
+        x = np.empty(stop - lo, dtype=np.float64)
+        self.expr.evaluate(source, lo, stop, x)
+
+        # shift by a valid value to limit cancellation in the running sums
+        valid = ~np.isnan(x)
+        if valid.any():
+            x -= x[valid.argmax()]
+        x[~valid] = 0
+
+        zero = np.zeros(1)
+        sums = np.concatenate((zero, np.cumsum(x)))
+        squares = np.concatenate((zero, np.cumsum(x * x)))
+        counts = np.concatenate((zero, np.cumsum(valid)))
+
+        end = np.arange(start - lo, stop - lo) + 1
+        begin = np.maximum(end - w, 0)
+        s = sums[end] - sums[begin]
+        var = (squares[end] - squares[begin] - s * s / w) / (w - 1)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            z = (x[end - 1] - s / w) / np.sqrt(np.maximum(var, 0))
+
+        z[(lo + end < w) | (counts[end] - counts[begin] < w)] = np.nan
+        out[:] = z
+
+    def columns(self) -> set[str]:
+        return self.expr.columns()
+
+    def __repr__(self) -> str:
+        return f"rolling_zscore({self.expr!r}, {self.window})"
+
+
+def _is_compound(operand: Expr | float) -> bool:
+    return isinstance(operand, Expr) and not isinstance(operand, Col)
+
+
+def _leaf(operand: Expr | float, source: Source, start: int, stop: int):
+    if isinstance(operand, Col):
+        return source(operand.name, start, stop)
+    return operand
+
+
+def col(name: str) -> Col:
+    """Reference a column by name.
+
+    Parameters
+    ----------
+    name : str
+        Name of a column of the source DataFrame or of a derived series.
+
+    Returns
+    -------
+    Col
+        The column expression.
+    """
+    return Col(name)
+
+
+def spread(long: str, short: str, scale: float = 100.0) -> Expr:
+    """Spread between two columns, by default in bps.
+
+    Parameters
+    ----------
+    long : str
+        Column of the long leg (e.g. ``us10y`` for 2s10s).
+    short : str
+        Column of the short leg (e.g. ``us02y`` for 2s10s).
+    scale : float
+        Scale of the spread. 100 converts yields in % to bps.
+
+    Returns
+    -------
+    Expr
+        The expression ``(long - short) * scale``.
+    """
+    return (col(long) - col(short)) * scale
+
+
+def butterfly(wing1: str, body: str, wing2: str, scale: float = 100.0) -> Expr:
+    """Butterfly spread between three columns, by default in bps.
+
+    Parameters
+    ----------
+    wing1 : str
+        Column of the first wing (e.g. ``us02y`` for 2s5s10s).
+    body : str
+        Column of the body (e.g. ``us05y`` for 2s5s10s).
+    wing2 : str
+        Column of the second wing (e.g. ``us10y`` for 2s5s10s).
+    scale : float
+        Scale of the spread. 100 converts yields in % to bps.
+
+    Returns
+    -------
+    Expr
+        The expression ``(2 * body - wing1 - wing2) * scale``.
+    """
+    return (2 * col(body) - col(wing1) - col(wing2)) * scale
+
+
+def rolling_zscore(expr: Expr | str, window: int) -> Expr:
+    """Rolling z-score of an expression or column.
+
+    Parameters
+    ----------
+    expr : Expr | str
+        The expression, or the name of a column.
+    window : int
+        Number of rows of the rolling window.
+
+    Returns
+    -------
+    Expr
+        The rolling z-score expression.
+
+    See Also
+    --------
+    derived_series.RollingZScore : The expression class.
+    """
+    if isinstance(expr, str):
+        expr = col(expr)
+    return RollingZScore(expr, window)
+
+
+class DerivedFrame:
+    """DataFrame with lazily computed and memoized derived series.
+
+    Derived series are declared as expressions and computed only when
+    selected, then memoized. Derived series can reference other derived
+    series by name with ``col``.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        The source DataFrame (e.g. preprocessed with
+        ``mpl_bsic.preprocess_dataframe``). It should not be modified
+        in place afterwards: use ``append`` to add rows.
+    \\*\\*definitions : Expr
+        The derived series, by name.
+
+    Attributes
+    ----------
+    data : pd.DataFrame
+        The source DataFrame.
+    definitions : dict[str, Expr]
+        The derived series expressions, by name.
+    """
+
+    def __init__(self, data: pd.DataFrame, **definitions: Expr) -> None:
+        self.data = data
+        self.definitions: dict[str, Expr] = {}
+        self._arrays: dict[str, np.ndarray] = {}
+        self._cache: dict[str, np.ndarray] = {}
+        self._stale: dict[str, np.ndarray] = {}
+        self._evaluating: set[str] = set()
+
+        self.define(**definitions)
+
+    def define(self, **definitions: Expr):
+        """Add or replace derived series.
+
+        Replacing a derived series clears all memoized results.
+
+        Parameters
+        ----------
+        \\*\\*definitions : Expr
+            The derived series, by name.
+
+        Raises
+        ------
+        Exception
+            If a name is already a column of the source DataFrame.
+        """
+        for name in definitions:
+            if name in self.data.columns:
+                raise Exception(f"{name} is already a column of the data.")
+            if name in self.definitions:
+                self._cache.clear()
+                self._stale.clear()
+
+        self.definitions.update(definitions)
+
+    @property
+    def columns(self) -> list[str]:
+        """The source and derived column names."""
+        return list(self.data.columns) + list(self.definitions)
+
+    @property
+    def computed(self) -> list[str]:
+        """The derived series that are memoized and up to date."""
+        return list(self._cache)
+
+    def __getitem__(self, key: str | list[str]) -> pd.Series | pd.DataFrame:
+        """Select source or derived columns.
+
+        Only the selected derived series (and the ones they depend on)
+        are computed.
+
+        Parameters
+        ----------
+        key : str | list[str]
+            A column name, or a list of column names.
+
+        Returns
+        -------
+        pd.Series | pd.DataFrame
+            A Series if key is a single name, a DataFrame otherwise.
+        """
+        if isinstance(key, str):
+            return self._series(key)
+
+        return pd.concat([self._series(name) for name in key], axis=1)
+
+    def append(self, rows: pd.DataFrame):
+        """Append rows to the source DataFrame.
+
+        The memoized derived series are kept, and only the appended rows
+        are computed the next time they are selected
+        (plus the lookback of rolling windows).
+
+        Parameters
+        ----------
+        rows : pd.DataFrame
+            The rows to append, with the same columns as the source.
+        """
+        self.data = pd.concat([self.data, rows])
+        self._arrays.clear()
+        self._stale.update(self._cache)
+        self._cache.clear()
+
+    def _series(self, name: str) -> pd.Series:
+        if name in self.definitions:
+            return pd.Series(self._values(name), index=self.data.index, name=name)
+        return self.data[name]
+
+    def _source(self, name: str, start: int, stop: int) -> np.ndarray:
+        if name in self.definitions:
+            return self._values(name)[start:stop]
+
+        if name not in self._arrays:
+            self._arrays[name] = self.data[name].to_numpy()
+        return self._arrays[name][start:stop]
+
+    def _dtype(self, expr: Expr) -> np.dtype:
+        dtypes = [
+            self._values(name).dtype
+            if name in self.definitions
+            else self.data[name].dtype
+            for name in expr.columns()
+        ]
+        return np.result_type(np.float32, *dtypes)
+
+    def _values(self, name: str) -> np.ndarray:
+        if name in self._cache:
+            return self._cache[name]
+
+        if name in self._evaluating:
+            raise Exception(f"circular definition of {name}.")
+
+        self._evaluating.add(name)
+        try:
+            expr = self.definitions[name]
+            n = len(self.data)
+            old = self._stale.pop(name, None)
+            start = 0 if old is None else len(old)
+
+            values = np.empty(n, dtype=self._dtype(expr))
+            if old is not None:
+                values[:start] = old
+            expr.evaluate(self._source, start, n, values[start:])
+        finally:
+            self._evaluating.discard(name)
+
+        self._cache[name] = values
+        return values
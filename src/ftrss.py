@@ -1,5 +1,22 @@
-import feedparser
-from typing import TypedDict
+import hashlib
+import http.client
+import json
+import math
+import os
+import random
+import re
+import sqlite3
+import queue
+import threading
+import time
+import urllib.request
+import zlib
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import IO, Callable, Iterable, Iterator, TypedDict
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
 
 
 class ArticleEntry(TypedDict):
@@ -9,19 +26,1153 @@ class ArticleEntry(TypedDict):
     summary: str
 
 
-def scan():
-    url = "https://www.ft.com/myft/following/982bd69e-6c56-4be0-9fd0-8e746875fb9e.rss"
+class FeedValidators(TypedDict):
+    """Cache validators of a feed, sent back to make the GET conditional."""
 
-    feed = feedparser.parse(url)
+    etag: str | None
+    modified: str | None
 
-    if feed is None:
+
+class FeedResult(TypedDict):
+    """Result of fetching one feed.
+
+    ``status`` is the HTTP status (None if the request failed),
+    ``entries`` is empty if the feed was not modified (304) or on errors.
+    """
+
+    url: str
+    status: int | None
+    entries: list[ArticleEntry]
+    error: str | None
+
+
+class FeedState(TypedDict):
+    """Polling state of a feed, kept by ``FeedScheduler``.
+
+    Timestamps are in seconds since the epoch, intervals in seconds.
+    """
+
+    interval: float
+    next_poll: float
+    errors: int
+    last_published: float | None
+
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_REDIRECTS = 5
+TRACKING_PARAMS = {"fbclid", "gclid", "ftcamp", "segmentid", "shareType"}
+SQLITE_MAX_PARAMS = 500
+
+
+FT_FEED_URL = (
+    "https://www.ft.com/myft/following/982bd69e-6c56-4be0-9fd0-8e746875fb9e.rss"
+)
+
+_ENTRY_TAGS = {"item", "entry"}
+_PUBLISHED_TAGS = ["pubDate", "published", "date", "updated"]
+_SUMMARY_TAGS = ["description", "summary", "content"]
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def _text(elem: ET.Element) -> str:
+    # itertext also covers atom type="xhtml" content, nested in a <div>
+    return "".join(elem.itertext()).strip()
+
+
+def _parse_entry(elem: ET.Element) -> ArticleEntry:
+    fields: dict[str, str] = {}
+    for child in elem:
+        name = _local_name(child.tag)
+        if name == "link" and child.get("href") is not None:
+            # atom links are in the href attribute, the article is rel="alternate"
+            if child.get("rel", "alternate") == "alternate":
+                fields.setdefault(name, child.get("href", ""))
+            continue
+        fields.setdefault(name, _text(child))
+
+    return {
+        "title": fields.get("title", ""),
+        "link": fields.get("link", ""),
+        "published": next((fields[t] for t in _PUBLISHED_TAGS if t in fields), ""),
+        "summary": next((fields[t] for t in _SUMMARY_TAGS if t in fields), ""),
+    }
+
+
+class _EntryParser:
+    """Incremental RSS/Atom parser, fed with chunks of the document."""
+
+    def __init__(self) -> None:
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._parents: list[ET.Element] = []
+
+    def feed(self, data: bytes) -> Iterator[ArticleEntry]:
+        self._parser.feed(data)
+        return self._entries()
+
+    def close(self) -> Iterator[ArticleEntry]:
+        self._parser.close()
+        return self._entries()
+
+    def _entries(self) -> Iterator[ArticleEntry]:
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                self._parents.append(elem)
+                continue
+
+            self._parents.pop()
+            if _local_name(elem.tag) in _ENTRY_TAGS:
+                yield _parse_entry(elem)
+                # drop the entry from the tree, so memory stays flat
+                if self._parents:
+                    self._parents[-1].remove(elem)
+
+
+def iter_entries(source: str | IO[bytes]) -> Iterator[ArticleEntry]:
+    """Parse a RSS/Atom feed incrementally, yielding its entries.
+
+    The feed is read in chunks and parsed with
+    ``xml.etree.ElementTree.XMLPullParser``, and each entry is discarded
+    once yielded, so memory stays flat regardless of the size of the feed.
+    RSS 2.0, RSS 1.0 and Atom feeds are supported.
+    This is the parser used by ``scan`` and ``FeedFetcher``.
+
+    Parameters
+    ----------
+    source : str | IO[bytes]
+        Path of the feed, or a binary file-like object
+        (e.g. an HTTP response).
+
+    Yields
+    ------
+    ArticleEntry
+        The entries of the feed, in document order.
+
+    Raises
+    ------
+    xml.etree.ElementTree.ParseError
+        If the feed is not well-formed XML.
+    """
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            yield from iter_entries(f)
         return
 
-    for entry in feed.entries:
-        print(
-            entry.title,
-            entry.link,
+    parser = _EntryParser()
+    while chunk := source.read(READ_CHUNK_SIZE):
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+def scan(url: str = FT_FEED_URL, timeout: float = 10.0) -> Iterator[ArticleEntry]:
+    """Stream the entries of a feed.
+
+    The response is parsed while it is being downloaded,
+    so the first entries are yielded before the whole feed is received.
+
+    Parameters
+    ----------
+    url : str
+        The url of the feed. Defaults to the FT feed.
+    timeout : float
+        Timeout of the request, in seconds.
+
+    Yields
+    ------
+    ArticleEntry
+        The entries of the feed.
+
+    Examples
+    --------
+    .. code:: python
+
+        for entry in scan():
+            print(entry["title"], entry["link"])
+    """
+    request = urllib.request.Request(url, headers={"User-Agent": "af_utils-ftrss"})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        yield from iter_entries(response)
+
+
+class FeedFetcher:
+    """Fetch many feeds concurrently, with conditional GETs.
+
+    Feeds are fetched by a bounded pool of threads. Each thread keeps one
+    keep-alive connection per host, reused across feeds and across calls
+    to ``fetch``. The ETag and Last-Modified headers of each feed are
+    stored in ``validators`` and sent back on the next fetch, so feeds
+    that did not change return 304 and are not parsed.
+    Responses are parsed with the same incremental parser as
+    ``iter_entries``, while they are being received.
+
+    Parameters
+    ----------
+    max_workers : int
+        Maximum number of feeds fetched at the same time.
+    timeout : float
+        Timeout of each request, in seconds.
+    retries : int
+        Number of retries on timeouts, connection errors and 429/5xx statuses.
+    backoff : float
+        Delay before the first retry, in seconds. It doubles at each retry.
+
+    Attributes
+    ----------
+    validators : dict[str, FeedValidators]
+        The cache validators of each feed, by url.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 16,
+        timeout: float = 10.0,
+        retries: int = 2,
+        backoff: float = 0.5,
+    ) -> None:
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.validators: dict[str, FeedValidators] = {}
+
+        self._executor = ThreadPoolExecutor(max_workers, "feed-fetcher")
+        self._local = threading.local()
+        self._connections: list[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    def fetch(self, urls: list[str]) -> list[FeedResult]:
+        """Fetch the feeds concurrently.
+
+        Parameters
+        ----------
+        urls : list[str]
+            The urls of the feeds.
+
+        Returns
+        -------
+        list[FeedResult]
+            The results, in the same order as urls.
+        """
+        return list(self._executor.map(self.fetch_one, urls))
+
+    def stream(self, urls: list[str]) -> Iterator[ArticleEntry]:
+        """Fetch the feeds concurrently, yielding entries as they are parsed.
+
+        Unlike ``fetch``, entries are handed to downstream stages while the
+        feeds are still being received, and are not accumulated in memory.
+        Failed and not-modified feeds yield nothing. If a feed fails midway
+        and is retried, the entries already yielded are not repeated.
+
+        Parameters
+        ----------
+        urls : list[str]
+            The urls of the feeds.
+
+        Yields
+        ------
+        ArticleEntry
+            The entries of the feeds.
+        """
+        done = object()
+        entries: queue.Queue = queue.Queue()
+
+        def work(url: str):
+            try:
+                self._fetch(url, entries.put)
+            finally:
+                entries.put(done)
+
+        for url in urls:
+            self._executor.submit(work, url)
+
+        remaining = len(urls)
+        while remaining:
+            entry = entries.get()
+            if entry is done:
+                remaining -= 1
+            else:
+                yield entry
+
+    def fetch_one(self, url: str) -> FeedResult:
+        """Fetch a single feed, retrying on transient errors.
+
+        Parameters
+        ----------
+        url : str
+            The url of the feed.
+
+        Returns
+        -------
+        FeedResult
+            The result of the fetch. Errors are reported in the result
+            instead of being raised.
+        """
+        return self._fetch(url)
+
+    def close(self):
+        """Shut down the thread pool and close the pooled connections."""
+        self._executor.shutdown()
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+
+    def __enter__(self) -> "FeedFetcher":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _fetch(
+        self, url: str, emit: Callable[[ArticleEntry], None] | None = None
+    ) -> FeedResult:
+        headers = {"Accept-Encoding": "gzip", "User-Agent": "af_utils-ftrss"}
+        validators = self.validators.get(url)
+        if validators:
+            if validators["etag"]:
+                headers["If-None-Match"] = validators["etag"]
+            if validators["modified"]:
+                headers["If-Modified-Since"] = validators["modified"]
+
+        error = None
+        emitted = 0
+        for attempt in range(self.retries + 1):
+            if attempt > 0:
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+
+            entries: list[ArticleEntry] = []
+            count = 0
+
+            def handle(entry: ArticleEntry):
+                nonlocal count, emitted
+                count += 1
+                if emit is None:
+                    entries.append(entry)
+                elif count > emitted:
+                    emit(entry)
+                    emitted = count
+
+            try:
+                status, response_headers = self._get(url, headers, handle)
+            except (
+                OSError,
+                EOFError,
+                zlib.error,
+                ET.ParseError,
+                http.client.HTTPException,
+            ) as e:
+                # EOFError and zlib.error come from truncated or corrupt gzip
+                # bodies, ParseError from truncated or malformed feeds
+                error = f"{type(e).__name__}: {e}"
+                continue
+
+            if status in RETRY_STATUSES:
+                error = f"HTTP {status}"
+                continue
+
+            if status == 200:
+                self.validators[url] = {
+                    "etag": response_headers.get("ETag"),
+                    "modified": response_headers.get("Last-Modified"),
+                }
+            error = None if status in (200, 304) else f"HTTP {status}"
+            return {"url": url, "status": status, "entries": entries, "error": error}
+
+        return {"url": url, "status": None, "entries": [], "error": error}
+
+    def _get(
+        self,
+        url: str,
+        headers: dict[str, str],
+        handle: Callable[[ArticleEntry], None],
+    ) -> tuple[int, http.client.HTTPMessage]:
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            path = parts.path or "/"
+            if parts.query:
+                path += "?" + parts.query
+
+            conn = self._connection(parts.scheme, parts.netloc)
+            try:
+                response = self._send(conn, path, headers)
+                if response.status == 200:
+                    self._parse(response, handle)
+                else:
+                    response.read()
+            except BaseException:
+                # the body was not fully read: the connection is unusable
+                conn.close()
+                raise
+
+            if response.will_close:
+                conn.close()
+
+            if response.status in (301, 302, 303, 307, 308):
+                url = urljoin(url, response.getheader("Location", ""))
+                continue
+
+            return response.status, response.headers
+
+        raise http.client.HTTPException("too many redirects")
+
+    def _send(
+        self, conn: http.client.HTTPConnection, path: str, headers: dict[str, str]
+    ) -> http.client.HTTPResponse:
+        reused = conn.sock is not None
+        try:
+            conn.request("GET", path, headers=headers)
+            return conn.getresponse()
+        except (ConnectionResetError, BrokenPipeError):
+            # RemoteDisconnected is a ConnectionResetError
+            if not reused:
+                raise
+            # the server closed the idle keep-alive connection before sending
+            # anything: reconnect and resend once, without using up a retry
+            conn.close()
+            conn.request("GET", path, headers=headers)
+            return conn.getresponse()
+
+    def _parse(
+        self,
+        response: http.client.HTTPResponse,
+        handle: Callable[[ArticleEntry], None],
+    ):
+        decoder = None
+        if response.getheader("Content-Encoding") == "gzip":
+            decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+        parser = _EntryParser()
+        while chunk := response.read(READ_CHUNK_SIZE):
+            if decoder:
+                chunk = decoder.decompress(chunk)
+            for entry in parser.feed(chunk):
+                handle(entry)
+
+        if decoder:
+            if not decoder.eof:
+                raise EOFError("gzip body ended before the end-of-stream marker")
+            for entry in parser.feed(decoder.flush()):
+                handle(entry)
+
+        for entry in parser.close():
+            handle(entry)
+
+    def _connection(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        if not hasattr(self._local, "connections"):
+            self._local.connections = {}
+
+        key = (scheme, netloc)
+        conn = self._local.connections.get(key)
+        if conn is None:
+            if scheme == "https":
+                conn = http.client.HTTPSConnection(netloc, timeout=self.timeout)
+            elif scheme == "http":
+                conn = http.client.HTTPConnection(netloc, timeout=self.timeout)
+            else:
+                raise http.client.HTTPException(f"unsupported scheme {scheme}")
+
+            self._local.connections[key] = conn
+            with self._lock:
+                self._connections.append(conn)
+
+        return conn
+
+
+def normalize_link(link: str) -> str:
+    """Normalize an article link, so that the same article has the same link.
+
+    The scheme and host are lowercased, the fragment, tracking parameters
+    (``utm_*`` and ``TRACKING_PARAMS``) and trailing slash are dropped.
+
+    Parameters
+    ----------
+    link : str
+        The link of the article.
+
+    Returns
+    -------
+    str
+        The normalized link.
+    """
+    parts = urlsplit(link.strip())
+    query = [
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.startswith("utm_") and k not in TRACKING_PARAMS
+    ]
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), "")
+    )
+
+
+def _entry_key(entry: ArticleEntry) -> bytes:
+    if entry["link"]:
+        text = normalize_link(entry["link"])
+    else:
+        text = entry["title"] + "\n" + entry["published"]
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+
+class ArticleStore:
+    """Persistent store of the articles already seen, backed by SQLite.
+
+    Articles are keyed by a 16-byte hash of their normalized link, stored in
+    a ``WITHOUT ROWID`` table so that the key lookups are a single B-tree
+    search even with millions of articles.
+
+    Parameters
+    ----------
+    path : str
+        Path of the SQLite database. Defaults to an in-memory database.
+    """
+
+    def __init__(self, path: str = ":memory:") -> None:
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+
+        with self._lock, self._conn:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS articles (
+                    key BLOB PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    link TEXT NOT NULL,
+                    published TEXT NOT NULL,
+                    summary TEXT NOT NULL,
+                    seen_at REAL NOT NULL
+                ) WITHOUT ROWID"""
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS articles_seen_at ON articles (seen_at)"
+            )
+
+    def add_new(
+        self, entries: Iterable[ArticleEntry], now: float | None = None
+    ) -> list[ArticleEntry]:
+        """Store the entries and return only the ones never seen before.
+
+        Duplicates within ``entries`` are returned once.
+
+        Parameters
+        ----------
+        entries : Iterable[ArticleEntry]
+            The entries of a poll.
+        now : float | None
+            Timestamp stored as the time the entries were first seen.
+            Defaults to ``time.time()``.
+
+        Returns
+        -------
+        list[ArticleEntry]
+            The new entries, in the order they were given.
+        """
+        batch: dict[bytes, ArticleEntry] = {}
+        for entry in entries:
+            batch.setdefault(_entry_key(entry), entry)
+
+        if not batch:
+            return []
+
+        seen_at = time.time() if now is None else now
+        keys = list(batch)
+
+        with self._lock, self._conn:
+            for i in range(0, len(keys), SQLITE_MAX_PARAMS):
+                chunk = keys[i : i + SQLITE_MAX_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key FROM articles WHERE key IN ({placeholders})", chunk
+                )
+                for (key,) in rows:
+                    del batch[key]
+
+            self._conn.executemany(
+                "INSERT INTO articles VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        key,
+                        e["title"],
+                        e["link"],
+                        e["published"],
+                        e["summary"],
+                        seen_at,
+                    )
+                    for key, e in batch.items()
+                ),
+            )
+
+        return list(batch.values())
+
+    def __contains__(self, entry: ArticleEntry) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM articles WHERE key = ?", (_entry_key(entry),)
+            ).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def prune(self, max_age: float, now: float | None = None) -> int:
+        """Delete the articles first seen more than ``max_age`` seconds ago.
+
+        Parameters
+        ----------
+        max_age : float
+            Retention, in seconds.
+        now : float | None
+            Current timestamp. Defaults to ``time.time()``.
+
+        Returns
+        -------
+        int
+            The number of deleted articles.
+        """
+        cutoff = (time.time() if now is None else now) - max_age
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM articles WHERE seen_at < ?", (cutoff,)
+            )
+        return cursor.rowcount
+
+    def close(self):
+        """Close the database connection."""
+        self._conn.close()
+
+    def __enter__(self) -> "ArticleStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def fetch_feeds(urls: list[str], max_workers: int = 16) -> list[FeedResult]:
+    """Fetch many feeds concurrently, once.
+
+    To make conditional GETs across polls, keep a ``FeedFetcher`` instead.
+
+    Parameters
+    ----------
+    urls : list[str]
+        The urls of the feeds.
+    max_workers : int
+        Maximum number of feeds fetched at the same time.
+
+    Returns
+    -------
+    list[FeedResult]
+        The results, in the same order as urls.
+    """
+    with FeedFetcher(max_workers) as fetcher:
+        return fetcher.fetch(urls)
+
+
+def parse_published(published: str) -> float | None:
+    """Parse the ``published`` date of an entry to a timestamp.
+
+    Both RFC 822 dates (RSS ``pubDate``) and ISO 8601 dates (Atom) are
+    supported. Dates without a timezone are assumed to be UTC.
+
+    Parameters
+    ----------
+    published : str
+        The published date of the entry.
+
+    Returns
+    -------
+    float | None
+        The timestamp, or None if the date cannot be parsed.
+    """
+    try:
+        date = parsedate_to_datetime(published)
+    except (TypeError, ValueError, IndexError):
+        try:
+            date = datetime.fromisoformat(published.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return date.timestamp()
+
+
+class FeedScheduler:
+    """Poll feeds at intervals adapted to how often they update.
+
+    The interval of each feed is learnt from the ``published`` dates of its
+    new entries: it moves (with exponential smoothing) towards half of the
+    typical gap between entries, and grows by ``idle_growth`` at each poll
+    without new entries. Failed polls are retried with exponential backoff
+    and jitter. At most ``max_concurrency`` feeds are fetched at the same
+    time, and the state can be saved to a JSON file, so that a restart does
+    not poll every feed at once.
+
+    Parameters
+    ----------
+    urls : list[str]
+        The urls of the feeds.
+    fetcher : FeedFetcher | None
+        The fetcher used to poll. If None, one is created
+        with ``max_concurrency`` workers.
+    state_path : str | None
+        JSON file where the state is saved after each poll, and loaded from
+        when the scheduler is created. If None, the state is not persisted.
+    min_interval : float
+        Minimum polling interval, in seconds. Must be greater than 0.
+    max_interval : float
+        Maximum polling interval, in seconds.
+    initial_interval : float
+        Interval of feeds with no history, in seconds.
+    max_backoff : float
+        Maximum delay before retrying a failing feed, in seconds.
+    max_concurrency : int
+        Maximum number of feeds polled at the same time.
+    smoothing : float
+        Weight of the latest estimate in the smoothed interval, in (0, 1].
+    idle_growth : float
+        Factor applied to the interval after a poll without new entries.
+    restart_spread : float
+        On load, overdue feeds are spread at random over this many seconds.
+    clock : Callable[[], float]
+        Function returning the current timestamp. Replace it to simulate time.
+    rng : random.Random | None
+        Random generator used for jitter.
+
+    Attributes
+    ----------
+    state : dict[str, FeedState]
+        The polling state of each feed, by url.
+    """
+
+    def __init__(
+        self,
+        urls: list[str],
+        fetcher: FeedFetcher | None = None,
+        state_path: str | None = None,
+        min_interval: float = 60.0,
+        max_interval: float = 6 * 3600.0,
+        initial_interval: float = 900.0,
+        max_backoff: float = 3600.0,
+        max_concurrency: int = 8,
+        smoothing: float = 0.3,
+        idle_growth: float = 1.25,
+        restart_spread: float = 300.0,
+        clock: Callable[[], float] = time.time,
+        rng: random.Random | None = None,
+    ) -> None:
+        if min_interval <= 0:
+            raise Exception("min_interval must be greater than 0.")
+
+        self.fetcher = fetcher if fetcher else FeedFetcher(max_concurrency)
+        self._owns_fetcher = fetcher is None
+        self.state_path = state_path
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.initial_interval = initial_interval
+        self.max_backoff = max_backoff
+        self.max_concurrency = max_concurrency
+        self.smoothing = smoothing
+        self.idle_growth = idle_growth
+        self.restart_spread = restart_spread
+        self.clock = clock
+        self.rng = rng if rng else random.Random()
+
+        self.state: dict[str, FeedState] = {}
+        if state_path and os.path.exists(state_path):
+            self.load()
+            self.state = {url: s for url, s in self.state.items() if url in urls}
+
+        now = self.clock()
+        for url in urls:
+            if url not in self.state:
+                self.state[url] = {
+                    "interval": initial_interval,
+                    "next_poll": now + self.rng.uniform(0, restart_spread),
+                    "errors": 0,
+                    "last_published": None,
+                }
+
+    def due(self) -> list[str]:
+        """Return the feeds to poll now, the most overdue first.
+
+        Returns
+        -------
+        list[str]
+            At most ``max_concurrency`` urls.
+        """
+        now = self.clock()
+        due = [url for url, s in self.state.items() if s["next_poll"] <= now]
+        due.sort(key=lambda url: self.state[url]["next_poll"])
+        return due[: self.max_concurrency]
+
+    def seconds_until_due(self) -> float:
+        """Return the number of seconds until the next feed is due.
+
+        If there are no feeds, ``max_interval`` is returned.
+        """
+        if not self.state:
+            return self.max_interval
+
+        next_poll = min(s["next_poll"] for s in self.state.values())
+        return max(0.0, next_poll - self.clock())
+
+    def poll(self) -> list[FeedResult]:
+        """Poll the due feeds and reschedule them.
+
+        Returns
+        -------
+        list[FeedResult]
+            The results of the polled feeds.
+        """
+        results = self.fetcher.fetch(self.due())
+        now = self.clock()
+        for result in results:
+            self.update(result, now)
+
+        if results and self.state_path:
+            self.save()
+        return results
+
+    def run(
+        self,
+        handle: Callable[[FeedResult], None],
+        sleep: Callable[[float], None] = time.sleep,
+        stop: Callable[[], bool] = lambda: False,
+    ):
+        """Poll the feeds forever (or until ``stop`` returns True).
+
+        Parameters
+        ----------
+        handle : Callable[[FeedResult], None]
+            Function called with the result of each poll.
+        sleep : Callable[[float], None]
+            Function sleeping for the given seconds.
+            Replace it, together with ``clock``, to simulate time.
+        stop : Callable[[], bool]
+            Function returning True when the loop should stop.
+        """
+        while not stop():
+            for result in self.poll():
+                handle(result)
+            sleep(self.seconds_until_due())
+
+    def update(self, result: FeedResult, now: float):
+        """Update the interval of a feed after a poll, and reschedule it.
+
+        Parameters
+        ----------
+        result : FeedResult
+            The result of the poll.
+        now : float
+            Timestamp of the poll.
+        """
+        state = self.state[result["url"]]
+
+        if result["status"] is None or result["error"] is not None:
+            state["errors"] += 1
+            # cap the exponent, so the delay never overflows after many errors
+            max_exponent = math.ceil(math.log2(self.max_backoff / self.min_interval))
+            exponent = min(state["errors"], max(0, max_exponent))
+            delay = min(self.max_backoff, self.min_interval * 2**exponent)
+            # "equal jitter": keep at least half of the backoff
+            state["next_poll"] = now + delay / 2 + self.rng.uniform(0, delay / 2)
+            return
+
+        state["errors"] = 0
+        last = state["last_published"]
+        published = sorted(
+            ts
+            for ts in map(parse_published, (e["published"] for e in result["entries"]))
+            if ts is not None and (last is None or ts > last)
+        )
+
+        interval = state["interval"]
+        history = ([] if last is None else [last]) + published
+        if published and len(history) >= 2:
+            # poll twice per typical (median) gap between entries
+            gaps = sorted(b - a for a, b in zip(history, history[1:]))
+            target = gaps[len(gaps) // 2] / 2
+            interval += self.smoothing * (target - interval)
+        elif not published:
+            interval *= self.idle_growth
+
+        if published:
+            state["last_published"] = published[-1]
+
+        state["interval"] = min(self.max_interval, max(self.min_interval, interval))
+        jitter = self.rng.uniform(0.9, 1.1)
+        state["next_poll"] = now + state["interval"] * jitter
+
+    def close(self):
+        """Close the fetcher, if it was created by the scheduler."""
+        if self._owns_fetcher:
+            self.fetcher.close()
+
+    def __enter__(self) -> "FeedScheduler":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def save(self):
+        """Save the state and the cache validators to ``state_path``.
+
+        The file is replaced atomically.
+        """
+        if self.state_path is None:
+            raise Exception("state_path is not set.")
+
+        data = {"feeds": self.state, "validators": self.fetcher.validators}
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.state_path)
+
+    def load(self):
+        """Load the state and the cache validators from ``state_path``.
+
+        Feeds that became due while the scheduler was stopped are spread at
+        random over ``restart_spread`` seconds, instead of all being due now.
+        """
+        if self.state_path is None:
+            raise Exception("state_path is not set.")
+
+        with open(self.state_path) as f:
+            data = json.load(f)
+
+        now = self.clock()
+        for state in data["feeds"].values():
+            if state["next_poll"] < now:
+                spread = min(self.restart_spread, state["interval"])
+                state["next_poll"] = now + self.rng.uniform(0, spread)
+
+        self.state.update(data["feeds"])
+        self.fetcher.validators.update(data["validators"])
+
+
+_QUERY_TOKEN = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def build_search_query(text: str) -> str:
+    """Convert a search string to a SQLite FTS5 query.
+
+    Words are matched as-is (so punctuation in tickers such as ``BRK.B``
+    is safe), ``"quoted text"`` is matched as a phrase, words ending with
+    ``*`` are matched as prefixes and ``OR`` / ``NOT`` are kept as
+    operators when they sit between two terms (otherwise they are matched
+    as words). All the other terms must match.
+
+    Parameters
+    ----------
+    text : str
+        The search string, e.g. ``'"rate hike" ECB infla*'``.
+
+    Returns
+    -------
+    str
+        The FTS5 query.
+    """
+    items: list[tuple[str, bool]] = []  # (text, is_operator)
+    for phrase, word in _QUERY_TOKEN.findall(text):
+        if word in ("OR", "NOT"):
+            items.append((word, True))
+            continue
+
+        prefix = word.endswith("*")
+        term = phrase if phrase else word.rstrip("*")
+        if not term.strip():
+            continue
+        quoted = '"' + term.replace('"', '""') + '"' + ("*" if prefix else "")
+        items.append((quoted, False))
+
+    # OR and NOT are binary in FTS5: keep them as operators only between two
+    # terms, otherwise (e.g. "NOT tesla", "ECB OR") search them as words
+    terms = []
+    last_is_term = False
+    for i, (item, is_operator) in enumerate(items):
+        next_is_term = i + 1 < len(items) and not items[i + 1][1]
+        if is_operator and not (last_is_term and next_is_term):
+            item = f'"{item}"'
+            is_operator = False
+        terms.append(item)
+        last_is_term = not is_operator
+
+    return " ".join(terms)
+
+
+class ArticleIndex:
+    """Full-text index of articles, backed by SQLite FTS5.
+
+    ``title`` and ``summary`` are indexed in an FTS5 table whose content is
+    the ``documents`` table, so the text is stored once. Prefixes of 2 and 3
+    characters are indexed too, to keep prefix queries fast. Articles are
+    added incrementally, e.g. with the new entries of ``ArticleStore``:
+
+    .. code:: python
+
+        new_entries = store.add_new(fetcher.stream(urls))
+        index.add(new_entries)
+        index.search('"rate hike" ECB', start=time.time() - 7 * 86400)
+
+    Parameters
+    ----------
+    path : str
+        Path of the SQLite database. Defaults to an in-memory database.
+    """
+
+    def __init__(self, path: str = ":memory:") -> None:
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+
+        with self._lock, self._conn:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS documents (
+                    id INTEGER PRIMARY KEY,
+                    key BLOB NOT NULL UNIQUE,
+                    title TEXT NOT NULL,
+                    link TEXT NOT NULL,
+                    published TEXT NOT NULL,
+                    summary TEXT NOT NULL,
+                    published_ts REAL
+                )"""
+            )
+            self._conn.execute(
+                """CREATE INDEX IF NOT EXISTS documents_published_ts
+                ON documents (published_ts)"""
+            )
+            self._conn.execute(
+                """CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5 (
+                    title,
+                    summary,
+                    content='documents',
+                    content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2',
+                    prefix='2 3'
+                )"""
+            )
+
+    def add(self, entries: Iterable[ArticleEntry]) -> int:
+        """Index the entries. Entries already indexed are skipped.
+
+        Parameters
+        ----------
+        entries : Iterable[ArticleEntry]
+            The entries to index.
+
+        Returns
+        -------
+        int
+            The number of entries added to the index.
+        """
+        rows = (
+            (
+                _entry_key(e),
+                e["title"],
+                e["link"],
+                e["published"],
+                e["summary"],
+                parse_published(e["published"]),
+            )
+            for e in entries
         )
 
+        with self._lock, self._conn:
+            last_id = self._conn.execute(
+                "SELECT COALESCE(MAX(id), 0) FROM documents"
+            ).fetchone()[0]
+            self._conn.executemany(
+                """INSERT OR IGNORE INTO documents
+                (key, title, link, published, summary, published_ts)
+                VALUES (?, ?, ?, ?, ?, ?)""",
+                rows,
+            )
+            cursor = self._conn.execute(
+                """INSERT INTO documents_fts (rowid, title, summary)
+                SELECT id, title, summary FROM documents WHERE id > ?""",
+                (last_id,),
+            )
+
+        return cursor.rowcount
+
+    def search(
+        self,
+        query: str,
+        start: float | None = None,
+        end: float | None = None,
+        limit: int = 20,
+    ) -> list[ArticleEntry]:
+        """Search the articles, best matches first.
+
+        Matches are ranked with BM25, with title matches weighted
+        twice as much as summary matches.
+
+        Parameters
+        ----------
+        query : str
+            The search string, see ``build_search_query``.
+        start : float | None
+            If given, only articles published at or after this timestamp.
+        end : float | None
+            If given, only articles published before this timestamp.
+        limit : int
+            Maximum number of results.
+
+        Returns
+        -------
+        list[ArticleEntry]
+            The matching articles.
+        """
+        match = build_search_query(query)
+        if not match:
+            return []
+
+        sql = """SELECT d.title, d.link, d.published, d.summary
+            FROM documents_fts JOIN documents AS d ON d.id = documents_fts.rowid
+            WHERE documents_fts MATCH ?"""
+        params: list = [match]
+        if start is not None:
+            sql += " AND d.published_ts >= ?"
+            params.append(start)
+        if end is not None:
+            sql += " AND d.published_ts < ?"
+            params.append(end)
+        sql += " ORDER BY bm25(documents_fts, 2.0, 1.0) LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        return [
+            {"title": title, "link": link, "published": published, "summary": summary}
+            for title, link, published, summary in rows
+        ]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def close(self):
+        """Close the database connection."""
+        self._conn.close()
+
+    def __enter__(self) -> "ArticleIndex":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
 
-scan()
+if __name__ == "__main__":
+    for entry in scan():
+        print(entry["title"], entry["link"])
@@ -45,12 +45,18 @@ Module Components
 -----------------
 """
 
+import hashlib
+import json
+import os
+from datetime import datetime
 from typing import Literal
 import matplotlib.pyplot as plt
 from matplotlib.figure import Figure
 from matplotlib.axes import Axes
+from matplotlib.collections import LineCollection
 import matplotlib.dates as mdates
 from cycler import cycler
+import numpy as np
 import pandas as pd
 
 DEFAULT_TITLE_STYLE = {
@@ -146,7 +152,70 @@ This is the examples section. WIP.
 """
 
 
-def preprocess_dataframe(df: pd.DataFrame):
+DATE_FORMAT_CANDIDATES = [
+    "%Y-%m-%d",
+    "%m/%d/%Y",
+    "%d/%m/%Y",
+    "%Y/%m/%d",
+    "%d-%m-%Y",
+    "%d.%m.%Y",
+    "%Y%m%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%m/%d/%Y %H:%M",
+    "%d/%m/%Y %H:%M",
+]
+"""Date formats tried, in order, by ``infer_date_format``.
+
+US-style ``%m/%d/%Y`` is tried before the European ``%d/%m/%Y``,
+so ambiguous samples (e.g. ``1/2/2021``) are read as US dates.
+
+See Also
+--------
+mpl_bsic.infer_date_format : The function that uses the candidates.
+mpl_bsic.read_timeseries_csv : The cached CSV loader.
+"""
+
+
+def infer_date_format(dates: pd.Series, sample_size: int = 50) -> str | None:
+    """Infer the date format of a column of date strings.
+
+    Only the first ``sample_size`` non-null values are checked
+    against ``DATE_FORMAT_CANDIDATES``, so the cost does not depend
+    on the length of the series.
+
+    Parameters
+    ----------
+    dates : pd.Series
+        The column of date strings.
+    sample_size : int
+        Number of values to check against each candidate format.
+
+    Returns
+    -------
+    str | None
+        The first candidate format that parses all the sampled values,
+        or None if no candidate matches.
+
+    See Also
+    --------
+    mpl_bsic.DATE_FORMAT_CANDIDATES : The formats that are tried.
+    """
+    sample = [str(d).strip() for d in dates.dropna().iloc[:sample_size]]
+    if not sample:
+        return None
+
+    for fmt in DATE_FORMAT_CANDIDATES:
+        try:
+            for value in sample:
+                datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        return fmt
+
+    return None
+
+
+def preprocess_dataframe(df: pd.DataFrame, date_format: str | None = None):
     """Handle and preprocess the DataFrame before plotting.
 
     Handle and preprocess the DataFrame before plotting.
@@ -157,11 +226,17 @@ def preprocess_dataframe(df: pd.DataFrame):
     ----------
     df : pd.DataFrame
         The DataFrame to preprocess.
+    date_format : str | None
+        Format of the dates, fed to ``pd.to_datetime``.
+        If None, it is inferred with ``infer_date_format``
+        (falling back to pandas' own inference).
 
     See Also
     --------
     mpl_bsic.apply_bsic_style :
         The function that applies the style to the plot.
+    mpl_bsic.read_timeseries_csv :
+        Read, preprocess and cache a CSV file in one go.
 
     Examples
     --------
@@ -172,7 +247,185 @@ def preprocess_dataframe(df: pd.DataFrame):
 
     if "date" in df.columns:
         df.set_index("date", inplace=True, drop=True)
-        df.index = pd.to_datetime(df.index)
+        is_datetime = pd.api.types.is_datetime64_any_dtype(df.index)
+        if date_format is None and not is_datetime:
+            date_format = infer_date_format(df.index.to_series())
+        df.index = pd.to_datetime(df.index, format=date_format)
+
+
+def _file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _has_pyarrow() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def read_timeseries_csv(
+    path: str,
+    date_format: str | None = None,
+    engine: Literal["c", "pyarrow"] = "c",
+    downcast: bool = True,
+    cache: Literal["feather", "parquet"] | None = "feather",
+    memory_map: bool = False,
+) -> pd.DataFrame:
+    r"""Read a timeseries CSV, preprocess it and cache the parsed frame.
+
+    The CSV is read, then preprocessed as in ``preprocess_dataframe``
+    (lowercase columns, datetime index) with an explicit or inferred
+    date format, so that ``pd.to_datetime`` never falls back to
+    element-wise parsing.
+
+    The parsed frame is saved next to the source
+    (e.g. ``usyieldsdata.csv.feather``) together with a small
+    ``.feather.meta.json`` file holding the source mtime, size and SHA-256.
+    On the next call the cache is reused if the mtime and size are
+    unchanged, or if the file was touched but its hash is the same,
+    and if ``date_format``, ``engine`` and ``downcast`` are the same.
+    Otherwise the CSV is parsed again and the cache rewritten.
+    If the cache cannot be written (e.g. read-only directory),
+    the parsed frame is returned without caching.
+
+    Parameters
+    ----------
+    path : str
+        Path of the CSV file.
+    date_format : str | None
+        Format of the ``date`` column.
+        If None, it is inferred with ``infer_date_format``.
+    engine : Literal['c', 'pyarrow']
+        Engine fed to ``pd.read_csv``. The ``pyarrow`` engine is
+        multi-threaded; if pyarrow is not installed, ``c`` is used.
+    downcast : bool
+        If True, ``float64`` columns are downcast to ``float32``
+        (plenty for yields and prices, and half the memory).
+    cache : Literal['feather', 'parquet'] | None
+        Format of the cache file. If None, no cache is read or written.
+        Caching requires pyarrow.
+    memory_map : bool
+        If True, the Feather cache is memory-mapped when read instead of
+        being loaded in memory. The Feather cache is written uncompressed
+        so that mapping it is zero-copy. Ignored for Parquet.
+
+    Returns
+    -------
+    pd.DataFrame
+        The preprocessed DataFrame, indexed by date.
+
+    See Also
+    --------
+    mpl_bsic.preprocess_dataframe :
+        The function that preprocesses the DataFrame before plotting.
+    mpl_bsic.infer_date_format :
+        The function that infers the date format.
+
+    Examples
+    --------
+    .. code:: python
+
+        from mpl_bsic import read_timeseries_csv
+
+        # first call parses the CSV and writes usyieldsdata.csv.feather
+        data = read_timeseries_csv("tests/data/usyieldsdata.csv")
+        # later calls read the feather file directly
+        data = read_timeseries_csv("tests/data/usyieldsdata.csv")
+    """
+    if (engine == "pyarrow" or cache is not None) and not _has_pyarrow():
+        print("warning: pyarrow is not installed, not using it")
+        engine = "c"
+        cache = None
+
+    stat = os.stat(path)
+    cache_path = f"{path}.{cache}"
+    meta_path = f"{cache_path}.meta.json"
+    digest = None
+    # everything besides the file content that changes the parsed frame
+    options = {"date_format": date_format, "engine": engine, "downcast": downcast}
+
+    if cache is not None and os.path.exists(cache_path):
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = {}
+
+        fresh = (
+            meta.get("mtime_ns") == stat.st_mtime_ns
+            and meta.get("size") == stat.st_size
+        )
+        if not fresh and meta.get("size") == stat.st_size:
+            digest = _file_digest(path)
+            fresh = meta.get("sha256") == digest
+            if fresh:
+                meta["mtime_ns"] = stat.st_mtime_ns
+                try:
+                    with open(meta_path, "w") as f:
+                        json.dump(meta, f)
+                except OSError:
+                    pass  # the hash is checked again next time
+
+        if fresh and all(meta.get(k) == v for k, v in options.items()):
+            return _read_cache(cache_path, cache, memory_map)
+
+    df = pd.read_csv(path, engine=engine)
+    preprocess_dataframe(df, date_format)
+
+    if downcast:
+        floats = df.select_dtypes("float64").columns
+        df[floats] = df[floats].astype("float32")
+
+    if cache is not None:
+        meta = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": digest if digest else _file_digest(path),
+            **options,
+        }
+        try:
+            _write_cache(df, cache_path, cache)
+            with open(meta_path, "w") as f:
+                json.dump(meta, f)
+        except OSError:
+            print(f"warning: cannot write the cache next to {path}, not caching")
+
+    return df
+
+
+def _write_cache(df: pd.DataFrame, cache_path: str, cache: str):
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    table = pa.Table.from_pandas(df)
+    if cache == "feather":
+        # a single chunk, so that columns are not concatenated (copied) on read
+        feather.write_feather(
+            table, cache_path, compression="uncompressed", chunksize=max(1, len(df))
+        )
+    else:
+        pq.write_table(table, cache_path)
+
+
+def _read_cache(cache_path: str, cache: str, memory_map: bool) -> pd.DataFrame:
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    if cache == "feather":
+        table = feather.read_table(cache_path, memory_map=memory_map)
+    else:
+        table = pq.read_table(cache_path)
+
+    # split_blocks avoids consolidating the columns into a new 2D block,
+    # so memory-mapped columns stay zero-copy where possible
+    return table.to_pandas(split_blocks=memory_map)
 
 
 def apply_bsic_style(fig: Figure, ax: Axes, title: str | None = None):
@@ -310,8 +563,82 @@ the font sizes will not be consistent across the article and the graph"""
     return width, height
 
 
+AUTO_TICKS_PER_INCH = 1.5
+"""Maximum number of x ticks per inch of axis width in ``"auto"`` mode.
+
+Labels are rotated by 45 degrees, so at the default font size
+about one and a half labels fit in an inch without overlapping.
+
+See Also
+--------
+mpl_bsic.format_timeseries_axis : The function that uses it.
+"""
+
+_AUTO_TICK_STEPS: list[tuple[Literal["Y", "M", "D"], int, float]] = [
+    ("D", 1, 1),
+    ("D", 2, 2),
+    ("D", 7, 7),
+    ("D", 14, 14),
+    ("M", 1, 30.44),
+    ("M", 2, 60.88),
+    ("M", 3, 91.31),
+    ("M", 6, 182.62),
+    ("Y", 1, 365.25),
+    ("Y", 2, 730.5),
+    ("Y", 5, 1826.25),
+    ("Y", 10, 3652.5),
+    ("Y", 20, 7305),
+    ("Y", 50, 18262.5),
+    ("Y", 100, 36525),
+]
+# (time_unit, freq, approximate step in days), from the densest to the sparsest
+
+_AUTO_DATE_FORMATS = {"D": "%d-%b-%y", "M": "%b-%y", "Y": "%Y"}
+
+
+def auto_time_unit(
+    span_days: float, width: float
+) -> tuple[Literal["Y", "M", "D"], int]:
+    """Choose the time unit and frequency of the x ticks.
+
+    Picks the densest step among a fixed list (1, 2, 7, 14 days;
+    1, 2, 3, 6 months; 1, 2, 5, 10, 20, 50, 100 years) that keeps
+    the number of ticks under ``AUTO_TICKS_PER_INCH * width``.
+    The cost does not depend on the length of the series.
+
+    Parameters
+    ----------
+    span_days : float
+        Span of the x-axis, in days.
+    width : float
+        Width of the axis, in inches.
+
+    Returns
+    -------
+    tuple[Literal['Y', 'M', 'D'], int]
+        The time unit and frequency to feed to ``format_timeseries_axis``.
+
+    See Also
+    --------
+    mpl_bsic.format_timeseries_axis :
+        The function that formats the x-axis.
+    """
+    max_ticks = max(2, int(width * AUTO_TICKS_PER_INCH))
+
+    for time_unit, freq, step_days in _AUTO_TICK_STEPS:
+        if span_days / step_days <= max_ticks:
+            return time_unit, freq
+
+    # beyond a few centuries, keep the ticks bounded anyway
+    return "Y", int(span_days / 365.25 / max_ticks) + 1
+
+
 def format_timeseries_axis(
-    ax: Axes, time_unit: Literal["Y", "M", "D"], freq: int, fmt: str | None
+    ax: Axes,
+    time_unit: Literal["Y", "M", "D", "auto"],
+    freq: int | None = None,
+    fmt: str | None = None,
+    width: float | None = None,
 ):
     """Format the x-axis of a timeseries plot.
 
@@ -319,19 +646,35 @@ def format_timeseries_axis(
     Note that this function does not take as an input the figure,
     but just the matplotlib Axes instance.
 
+    With ``time_unit="auto"``, the unit and frequency are chosen with
+    ``auto_time_unit`` from the current x limits and the width of the axis,
+    so that the number of tick labels stays bounded.
+    In this case the function must be called *after* plotting the data.
+    The locator is fixed from the x limits at call time: it does not adapt
+    if the x limits change afterwards (e.g. zooming or ``ax.set_xlim``),
+    so call the function again after changing them.
+
     Parameters
     ----------
     ax : matplotlib.axes.Axes
         Matplotlib Axes instance.
-    time_unit : Literal['Y', 'M', 'D']
+    time_unit : Literal['Y', 'M', 'D', 'auto']
         Time unit to use.
-        Can be "Y" for years, "M" for months, or "D" for days.
-    freq : int
+        Can be "Y" for years, "M" for months, "D" for days,
+        or "auto" to choose it from the data span.
+    freq : int | None
         Time Frequency. For example, if time_unit is "M" and freq is 3,
         then the x-axis will have a tick every 3 months.
+        Ignored (and may be None) if time_unit is "auto".
     fmt : str | None
         Date Format which will be fed to matplotlib.dates.DateFormatter.
         If None, the default format will be used (`%b-%y`).
+        In "auto" mode, the default depends on the chosen unit
+        (`%d-%b-%y` for days, `%b-%y` for months, `%Y` for years).
+    width : float | None
+        Width of the axis (not of the figure), in inches,
+        used in "auto" mode.
+        If None, it is read from the Axes and its Figure.
 
     Raises
     ------
@@ -342,22 +685,205 @@ def format_timeseries_axis(
     --------
     mpl_bsic.apply_bsic_style :
         The function that applies the style to the plot.
+    mpl_bsic.auto_time_unit :
+        The function that chooses the time unit in "auto" mode.
 
     Examples
     --------
-    Examples will come soon.
+    .. code:: python
+
+        fig, ax = plt.subplots(1, 1)
+        apply_bsic_style(fig, ax, "US 10Y Yield")
+        ax.plot(data["us10y"])
+        format_timeseries_axis(ax, "auto")
     """
 
+    if time_unit == "auto":
+        if width is None:
+            width = ax.get_position().width * ax.get_figure().get_figwidth()
+        x_min, x_max = ax.get_xlim()
+        time_unit, freq = auto_time_unit(abs(x_max - x_min), width)
+        if fmt is None:
+            fmt = _AUTO_DATE_FORMATS[time_unit]
+
+    if freq is None:
+        raise Exception("you must specify freq unless time_unit is 'auto'.")
+
     match time_unit:
         case "Y":
             ax.xaxis.set_major_locator(mdates.YearLocator(freq))
         case "M":
             ax.xaxis.set_major_locator(mdates.MonthLocator(interval=freq))
         case "D":
-            ax.xaxis.set_major_locator(mdates.DayLocator(freq))
+            ax.xaxis.set_major_locator(mdates.DayLocator(interval=freq))
         case _:
             raise Exception("this time frequency is not supported.")
 
     date_format = fmt if fmt else "%b-%y"
     ax.xaxis.set_major_formatter(mdates.DateFormatter(date_format))
     ax.tick_params(axis="x", rotation=45)
+
+
+def plot_line_collection(ax: Axes, data: pd.DataFrame, **kwargs) -> LineCollection:
+    r"""Plot all the columns of a DataFrame as a single ``LineCollection``.
+
+    ``ax.plot(data)`` creates one ``Line2D`` artist per column, and with
+    hundreds of short series the per-artist overhead is a large part of
+    the time spent creating and drawing them.
+    This function draws every column as one segment of a single
+    ``LineCollection``, coloured with the BSIC color cycle.
+    NaN values produce gaps in the lines, as with ``ax.plot``.
+
+    Collections do not simplify paths, so for a few long series
+    (thousands of points each) ``ax.plot`` draws faster.
+
+    Parameters
+    ----------
+    ax : matplotlib.axes.Axes
+        Matplotlib Axes instance.
+    data : pd.DataFrame
+        The data to plot. Each column is a series, plotted against the index.
+        A ``DatetimeIndex`` is converted to matplotlib dates.
+    \*\*kwargs
+        Other keyword arguments fed to ``LineCollection``
+        (e.g. ``linewidths``, ``alpha``).
+
+    Returns
+    -------
+    matplotlib.collections.LineCollection
+        The collection added to the Axes.
+
+    See Also
+    --------
+    mpl_bsic.plot_small_multiples :
+        Plot many panels of series in a grid.
+    mpl_bsic.DEFAULT_COLOR_CYCLE :
+        The colors used for the lines.
+
+    Examples
+    --------
+    .. code:: python
+
+        fig, ax = plt.subplots(1, 1)
+        apply_bsic_style(fig, ax, "US Yields")
+        plot_line_collection(ax, data[["us02y", "us10y", "us30y"]])
+    """
+    if isinstance(data.index, pd.DatetimeIndex):
+        x = mdates.date2num(data.index)
+        ax.xaxis_date()
+    else:
+        x = data.index.to_numpy(dtype=float)
+
+    y = data.to_numpy(dtype=float).T
+    segments = np.empty((y.shape[0], y.shape[1], 2))
+    segments[:, :, 0] = x
+    segments[:, :, 1] = y
+
+    colors = [c["color"] for c in DEFAULT_COLOR_CYCLE]
+    kwargs.setdefault("colors", [colors[i % len(colors)] for i in range(len(y))])
+    kwargs.setdefault("linewidths", plt.rcParams["lines.linewidth"])
+
+    collection = LineCollection(segments, **kwargs)
+    ax.add_collection(collection)
+    ax.autoscale_view()
+
+    return collection
+
+
+def plot_small_multiples(
+    panels: dict[str, pd.DataFrame],
+    ncols: int = 2,
+    width: float = 7.32,
+    height: float | None = None,
+    aspect_ratio: float | None = 0.75,
+    sharey: bool = False,
+    time_unit: Literal["Y", "M", "D", "auto"] | None = None,
+    freq: int = 1,
+    fmt: str | None = None,
+    **kwargs,
+) -> tuple[Figure, np.ndarray]:
+    r"""Plot a grid of panels, each with many series, in BSIC style.
+
+    The BSIC style is applied once for the whole grid, the x-axis is
+    shared across panels (so the date locator and formatter are set only
+    once) and each panel is drawn with ``plot_line_collection``,
+    i.e. with a single artist regardless of the number of series.
+
+    Parameters
+    ----------
+    panels : dict[str, pd.DataFrame]
+        Mapping from panel title to the DataFrame plotted in the panel.
+    ncols : int
+        Number of columns of the grid.
+    width : float
+        Width of the Figure, in inches.
+    height : float | None
+        Height of the Figure, in inches.
+    aspect_ratio : float | None
+        Aspect Ratio of the figure, used if ``height`` is None.
+        Defaults to 0.75 (the height is 0.75 times the width).
+    sharey : bool
+        Whether the panels share the y-axis.
+    time_unit : Literal['Y', 'M', 'D', 'auto'] | None
+        Time unit fed to ``format_timeseries_axis``.
+        With "auto", the ticks are chosen from the width of one panel.
+        If None, the x-axis is not formatted.
+    freq : int
+        Time Frequency fed to ``format_timeseries_axis``.
+    fmt : str | None
+        Date Format fed to ``format_timeseries_axis``.
+    \*\*kwargs
+        Other keyword arguments fed to ``plot_line_collection``.
+
+    Returns
+    -------
+    tuple[matplotlib.figure.Figure, numpy.ndarray]
+        The Figure and the 2D array of Axes of the grid.
+        Unused cells of the grid are hidden.
+
+    See Also
+    --------
+    mpl_bsic.plot_line_collection :
+        The function that draws the series of each panel.
+    mpl_bsic.format_timeseries_axis :
+        The function that formats the shared x-axis.
+
+    Examples
+    --------
+    .. code:: python
+
+        panels = {"US": us_yields, "DE": de_yields, "IT": it_yields}
+        fig, axes = plot_small_multiples(
+            panels, ncols=3, aspect_ratio=1 / 3, time_unit="Y", freq=1
+        )
+    """
+    width, height = check_figsize(width, height, aspect_ratio)
+    nrows = -(-len(panels) // ncols)
+
+    plt.rcParams["font.sans-serif"] = BSIC_FONT_FAMILY
+    plt.rcParams["font.size"] = DEFAULT_FONT_SIZE
+    plt.rcParams["axes.prop_cycle"] = DEFAULT_COLOR_CYCLE
+
+    fig, axes = plt.subplots(
+        nrows, ncols, sharex=True, sharey=sharey, squeeze=False
+    )
+    fig.set_size_inches(width, height)
+
+    flat_axes = axes.ravel()
+    for ax, (title, data) in zip(flat_axes, panels.items()):
+        ax.set_title(title, **DEFAULT_TITLE_STYLE)
+        plot_line_collection(ax, data, **kwargs)
+
+    for i in range(len(panels), len(flat_axes)):
+        flat_axes[i].set_visible(False)
+        # sharex only labels the bottom row: label the panel above the empty cell
+        if i >= ncols:
+            flat_axes[i - ncols].tick_params(axis="x", labelbottom=True)
+
+    if time_unit:
+        # the x-axis is shared, so the locator and formatter are shared too
+        format_timeseries_axis(flat_axes[0], time_unit, freq, fmt)
+        for ax in flat_axes[1:]:
+            ax.tick_params(axis="x", rotation=45)
+
+    return fig, axes
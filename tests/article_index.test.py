@@ -0,0 +1,90 @@
+import random
+import time
+from email.utils import formatdate
+import test_setup  # noqa
+from ftrss import ArticleIndex, build_search_query
+
+assert build_search_query('"rate hike" BRK.B infla* OR x"') == (
+    '"rate hike" "BRK.B" "infla"* OR "x"""'
+)
+
+T0 = 1_600_000_000
+WORDS = (
+    "bond yield curve inflation rate hike cut central bank equity credit spread "
+    "default growth recession oil gas dollar euro yen gilt bund treasury auction "
+    "earnings guidance merger deal private equity fund hedge volatility"
+).split()
+TICKERS = ["AAPL", "MSFT", "BRK.B", "TSLA", "NVDA", "JPM", "GS", "BARC"]
+rng = random.Random(0)
+
+
+FILLER = [f"w{i}" for i in range(20_000)]
+
+
+def article(i: int) -> dict:
+    words = rng.choices(FILLER, k=30)
+    for j in rng.sample(range(30), 3):
+        words[j] = rng.choice(WORDS)
+    return {
+        "title": f"{rng.choice(TICKERS)} {' '.join(words[:6])}",
+        "link": f"https://www.ft.com/content/{i}",
+        "published": formatdate(T0 + i * 60, usegmt=True),
+        "summary": " ".join(words[6:]),
+    }
+
+
+with ArticleIndex() as index:
+    index.add(
+        [
+            {
+                "title": "ECB signals rate hike as inflation persists",
+                "link": "https://www.ft.com/content/ecb",
+                "published": "2023-10-26T12:15:00Z",
+                "summary": "The European Central Bank raised rates.",
+            },
+            {
+                "title": "Berkshire results",
+                "link": "https://www.ft.com/content/brk",
+                "published": "Sat, 04 Nov 2023 13:00:00 GMT",
+                "summary": "BRK.B shares rose after the ECB decision.",
+            },
+        ]
+    )
+    assert [a["link"][-3:] for a in index.search("ECB")] == ["ecb", "brk"]
+    assert [a["link"][-3:] for a in index.search('"rate hike" infla*')] == ["ecb"]
+    assert [a["link"][-3:] for a in index.search("BRK.B")] == ["brk"]
+    assert index.search("ECB", start=1698796800) == index.search("berkshire")
+    assert index.add(index.search("ECB")) == 0
+
+    # misplaced operators are searched as words instead of raising
+    assert build_search_query("NOT tesla") == '"NOT" "tesla"'
+    assert build_search_query("ECB OR NOT x") == '"ECB" "OR" NOT "x"'
+    for query in ["NOT tesla", "ECB OR", "ECB NOT", "OR", "ECB OR OR rates"]:
+        index.search(query)
+    assert len(index.search("ECB OR berkshire")) == 2
+    assert [a["link"][-3:] for a in index.search("ECB NOT berkshire")] == ["ecb"]
+
+    n = 200_000
+    batch = 10_000
+    t0 = time.perf_counter()
+    for start in range(0, n, batch):
+        index.add(article(i) for i in range(start, start + batch))
+    t1 = time.perf_counter()
+    print(f"indexing: {n / (t1 - t0):,.0f} articles/s ({len(index):,} indexed)")
+
+    queries = {
+        "term": ("inflation", None, None),
+        "ticker": ("BRK.B", None, None),
+        "phrase": ('"rate hike"', None, None),
+        "prefix": ("infl* recess*", None, None),
+        "date range": ('"central bank" GS', T0 + 30 * 86400, T0 + 60 * 86400),
+    }
+    for name, (query, start, end) in queries.items():
+        timings = []
+        for _ in range(20):
+            t = time.perf_counter()
+            results = index.search(query, start, end, limit=20)
+            timings.append(time.perf_counter() - t)
+        timings.sort()
+        assert results, name
+        print(f"{name:>10}: {timings[10] * 1000:6.2f}ms median query latency")
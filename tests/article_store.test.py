@@ -0,0 +1,43 @@
+import os
+import tempfile
+import time
+import test_setup  # noqa
+from ftrss import ArticleStore, normalize_link
+
+
+def article(i: int) -> dict:
+    return {
+        "title": f"Article {i}",
+        "link": f"https://www.ft.com/content/{i}",
+        "published": "Mon, 30 Oct 2023 10:00:00 GMT",
+        "summary": f"Summary {i}",
+    }
+
+
+assert normalize_link("HTTPS://www.FT.com/content/1/?utm_source=rss#top") == (
+    "https://www.ft.com/content/1"
+)
+
+with tempfile.TemporaryDirectory() as tmp:
+    with ArticleStore(os.path.join(tmp, "articles.db")) as store:
+        first = store.add_new([article(1), article(2), article(1)], now=0)
+        assert [e["title"] for e in first] == ["Article 1", "Article 2"]
+
+        tracked = article(2) | {"link": "https://www.ft.com/content/2?utm_medium=x"}
+        assert store.add_new([tracked, article(3)], now=10) == [article(3)]
+        assert article(3) in store and article(4) not in store
+
+        assert store.prune(max_age=5, now=12) == 2
+        assert len(store) == 1
+
+        n = 200_000
+        t0 = time.perf_counter()
+        for start in range(0, n, 10_000):
+            store.add_new((article(i) for i in range(start, start + 10_000)), now=20)
+        t1 = time.perf_counter()
+        new = store.add_new(article(i) for i in range(n - 50, n + 50))
+        t2 = time.perf_counter()
+        assert len(new) == 50
+
+print(f"bulk insert: {n / (t1 - t0):,.0f} articles/s")
+print(f"poll of 100 entries over {n:,} articles: {(t2 - t1) * 1000:.2f}ms")
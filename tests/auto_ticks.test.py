@@ -0,0 +1,30 @@
+import time
+import warnings
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+import test_setup  # noqa
+from mpl_bsic import apply_bsic_style, auto_time_unit, format_timeseries_axis
+
+assert auto_time_unit(30, 6) == ("D", 7)
+assert auto_time_unit(365, 6) == ("M", 2)
+assert auto_time_unit(20 * 365.25, 6) == ("Y", 5)
+
+dates = pd.date_range("2003-01-01", "2023-12-31", freq="D")
+data = pd.Series(np.random.default_rng(0).standard_normal(len(dates)).cumsum(), dates)
+
+fig, ax = plt.subplots(1, 1)
+fig.set_size_inches(7.32, 3)
+apply_bsic_style(fig, ax, "20 Years of Daily Data")
+ax.plot(data)
+
+t0 = time.perf_counter()
+format_timeseries_axis(ax, "auto")
+with warnings.catch_warnings():
+    warnings.simplefilter("error")
+    fig.canvas.draw()
+print(f"auto ticks + draw: {(time.perf_counter() - t0) * 1000:.1f}ms")
+
+n_ticks = len(ax.get_xticks())
+assert 2 <= n_ticks <= 7.32 * 1.5, n_ticks
+plt.show()
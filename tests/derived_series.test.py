@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import test_setup  # noqa
+from derived_series import DerivedFrame, Expr, butterfly, col, rolling_zscore, spread
+from mpl_bsic import preprocess_dataframe
+
+data = pd.read_csv("tests/data/usyieldsdata.csv")
+preprocess_dataframe(data)
+
+derived = DerivedFrame(
+    data.iloc[:-20],
+    s2s10s=spread("us10y", "us02y"),
+    fly=butterfly("us02y", "us10y", "us30y"),
+    z2s10s=rolling_zscore(col("s2s10s"), 20),
+    ratio=(col("us30y") - col("us10y")) / (col("us10y") - col("us02y")),
+)
+
+s2s10s = (data["us10y"] - data["us02y"]) * 100
+fly = (2 * data["us10y"] - data["us02y"] - data["us30y"]) * 100
+z2s10s = (s2s10s - s2s10s.rolling(20).mean()) / s2s10s.rolling(20).std()
+ratio = (data["us30y"] - data["us10y"]) / (data["us10y"] - data["us02y"])
+
+result = derived[["us10y", "s2s10s"]]
+assert list(result.columns) == ["us10y", "s2s10s"]
+assert derived.computed == ["s2s10s"]
+
+# incremental update: only the 20 appended rows are computed,
+# plus the 19 rows of lookback of the rolling z-score
+derived["z2s10s"]
+assert sorted(derived.computed) == ["s2s10s", "z2s10s"]
+derived.append(data.iloc[-20:])
+assert derived.computed == []
+
+requested = []
+source = derived._source
+
+
+def spy(name: str, start: int, stop: int) -> np.ndarray:
+    requested.append((name, start, stop))
+    return source(name, start, stop)
+
+
+derived._source = spy
+derived[["s2s10s", "z2s10s"]]
+n = len(data)
+assert sorted(set(requested)) == [
+    ("s2s10s", n - 39, n),
+    ("us02y", n - 20, n),
+    ("us10y", n - 20, n),
+], requested
+derived._source = source
+
+result = derived[["s2s10s", "fly", "z2s10s", "ratio"]]
+
+pd.testing.assert_series_equal(result["s2s10s"], s2s10s, check_names=False)
+pd.testing.assert_series_equal(result["fly"], fly, check_names=False)
+pd.testing.assert_series_equal(result["ratio"], ratio, check_names=False)
+np.testing.assert_allclose(result["z2s10s"], z2s10s, rtol=1e-6)
+
+
+class Incomplete(Expr):
+    def columns(self) -> set[str]:
+        return set()
+
+
+try:
+    Incomplete()
+except TypeError:
+    pass
+else:
+    raise AssertionError("Expr subclasses must implement evaluate")
+
+print(result)
@@ -0,0 +1,112 @@
+import gzip
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import test_setup  # noqa
+from ftrss import FeedFetcher
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Test</title>
+<item><title>Fed holds rates</title><link>http://example.com/1</link>
+<pubDate>Mon, 30 Oct 2023 10:00:00 GMT</pubDate><description>Summary 1</description></item>
+<item><title>Bund yields rise</title><link>http://example.com/2</link>
+<pubDate>Mon, 30 Oct 2023 11:00:00 GMT</pubDate><description>Summary 2</description></item>
+</channel></rss>"""
+
+requests = {"count": 0, "flaky": 0}
+connections = set()
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        requests["count"] += 1
+        connections.add(self.client_address)
+
+        if self.path == "/truncated.rss":
+            body = gzip.compress(RSS)[:-20]
+            return self._send(200, body, {"Content-Encoding": "gzip"})
+        if self.path == "/corrupt.rss":
+            body = gzip.compress(RSS)
+            body = body[:30] + bytes(20) + body[50:]
+            return self._send(200, body, {"Content-Encoding": "gzip"})
+        if self.path == "/slow.rss":
+            time.sleep(1)
+        if self.path == "/flaky.rss":
+            requests["flaky"] += 1
+            if requests["flaky"] == 1:
+                return self._send(503, b"")
+
+        if self.headers.get("If-None-Match") == '"v1"':
+            return self._send(304, b"")
+        self._send(200, RSS, {"ETag": '"v1"'})
+
+    def _send(self, status, body, headers={}):
+        self.send_response(status)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+server.handle_error = lambda *args: None  # the timed out client hangs up
+threading.Thread(target=server.serve_forever, daemon=True).start()
+base = f"http://127.0.0.1:{server.server_port}"
+
+urls = [f"{base}/feed{i}.rss" for i in range(200)] + [f"{base}/flaky.rss"]
+
+with FeedFetcher(max_workers=8, timeout=0.5, retries=1, backoff=0.01) as fetcher:
+    t0 = time.perf_counter()
+    results = fetcher.fetch(urls)
+    t1 = time.perf_counter()
+    assert all(r["status"] == 200 for r in results), results[-1]
+    assert results[0]["entries"][0]["title"] == "Fed holds rates"
+    assert len(connections) <= 8, len(connections)
+
+    again = fetcher.fetch(urls)
+    t2 = time.perf_counter()
+    assert all(r["status"] == 304 and not r["entries"] for r in again)
+    assert len(connections) <= 8, len(connections)
+
+    # a bad feed is reported in its result, without failing the batch
+    bad = fetcher.fetch([f"{base}/truncated.rss", f"{base}/corrupt.rss", urls[0]])
+    assert [r["status"] for r in bad] == [None, None, 304], bad
+    assert bad[0]["error"].startswith("EOFError")
+
+    slow = fetcher.fetch_one(f"{base}/slow.rss")
+    assert slow["status"] is None and "timeout" in slow["error"].lower(), slow
+
+print(f"first poll: {(t1 - t0) * 1000:.0f}ms, conditional poll: {(t2 - t1) * 1000:.0f}ms")
+print(f"{requests['count']} requests over {len(connections)} connections")
+
+with FeedFetcher(max_workers=8) as fetcher:
+    titles = [entry["title"] for entry in fetcher.stream(urls[:10])]
+    assert len(titles) == 20 and titles[0] == "Fed holds rates"
+
+
+class IdleClosingHandler(Handler):
+    timeout = 0.3  # close keep-alive connections idle for more than 0.3s
+
+
+idle_server = ThreadingHTTPServer(("127.0.0.1", 0), IdleClosingHandler)
+threading.Thread(target=idle_server.serve_forever, daemon=True).start()
+idle_url = f"http://127.0.0.1:{idle_server.server_port}/feed.rss"
+
+# a pooled connection closed by the server is reopened at once,
+# without using up a retry or sleeping for the backoff
+with FeedFetcher(max_workers=1, retries=0, backoff=5) as fetcher:
+    assert fetcher.fetch_one(idle_url)["status"] == 200
+    time.sleep(0.6)
+    t0 = time.perf_counter()
+    result = fetcher.fetch_one(idle_url)
+    assert result["status"] == 304, result
+    assert time.perf_counter() - t0 < 1
+
+idle_server.shutdown()
+server.shutdown()
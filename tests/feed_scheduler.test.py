@@ -0,0 +1,119 @@
+import os
+import random
+import tempfile
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import test_setup  # noqa
+from ftrss import FeedFetcher, FeedScheduler
+
+# simulated clock, shared by the scheduler and the feed server
+clock = {"now": 1_700_000_000.0}
+START = clock["now"]
+PERIODS = {"/fast.rss": 600, "/slow.rss": 12 * 3600}
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    timeout = 0.01  # close idle keep-alive connections, as real servers do
+
+    def do_GET(self):
+        if self.path == "/broken.rss":
+            return self._send(500, b"")
+
+        # one entry every period, the feed shows the last 10
+        period = PERIODS[self.path]
+        last = int((clock["now"] - START) // period)
+        items = "".join(
+            f"<item><title>{i}</title><link>http://example.com{self.path}/{i}</link>"
+            f"<pubDate>{formatdate(START + i * period, usegmt=True)}</pubDate></item>"
+            for i in range(max(0, last - 9), last + 1)
+        )
+        self._send(200, f"<rss><channel>{items}</channel></rss>".encode())
+
+    def _send(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+base = f"http://127.0.0.1:{server.server_port}"
+urls = [f"{base}/fast.rss", f"{base}/slow.rss", f"{base}/broken.rss"]
+
+
+def sleep(seconds: float):
+    clock["now"] += seconds
+    # let the server close the idle connections, so every later poll
+    # runs over a stale pooled connection
+    time.sleep(0.02)
+
+
+polls = {url: 0 for url in urls}
+
+
+def handle(result):
+    polls[result["url"]] += 1
+    if result["url"] != urls[2]:
+        assert result["error"] is None, result
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    state_path = os.path.join(tmp, "state.json")
+    scheduler = FeedScheduler(
+        urls,
+        fetcher=FeedFetcher(retries=0),
+        state_path=state_path,
+        max_concurrency=2,
+        clock=lambda: clock["now"],
+        rng=random.Random(0),
+    )
+    end = clock["now"] + 3 * 24 * 3600
+    scheduler.run(handle, sleep=sleep, stop=lambda: clock["now"] > end)
+    scheduler.fetcher.close()  # not owned by the scheduler
+
+    fast, slow, broken = (scheduler.state[url] for url in urls)
+    print({url.rsplit("/", 1)[-1]: n for url, n in polls.items()})
+    print(f"fast: {fast['interval']:.0f}s, slow: {slow['interval']:.0f}s")
+    assert 60 <= fast["interval"] <= 600
+    assert slow["interval"] >= 3 * 3600
+    assert broken["errors"] > 5 and polls[urls[2]] < polls[urls[0]]
+
+    # after a day offline, the restart does not poll every feed at once
+    clock["now"] += 24 * 3600
+    with FeedScheduler(
+        urls, state_path=state_path, clock=lambda: clock["now"]
+    ) as restarted:
+        assert restarted.state[urls[1]]["interval"] == slow["interval"]
+        assert restarted.due() == []
+        assert restarted.seconds_until_due() <= 300
+
+# after a month of errors the backoff is capped, and does not overflow
+with FeedScheduler([urls[2]], clock=lambda: clock["now"]) as scheduler:
+    scheduler.state[urls[2]]["errors"] = 1100
+    scheduler.update(
+        {"url": urls[2], "status": None, "entries": [], "error": "HTTP 500"},
+        clock["now"],
+    )
+    assert scheduler.seconds_until_due() <= scheduler.max_backoff
+
+try:
+    FeedScheduler(urls, min_interval=0)
+except Exception:
+    pass
+else:
+    raise AssertionError("min_interval=0 must be rejected")
+
+# with no feeds, run() sleeps instead of spinning
+with FeedScheduler([], clock=lambda: clock["now"]) as scheduler:
+    sleeps = []
+    scheduler.run(handle, sleep=sleeps.append, stop=lambda: len(sleeps) >= 3)
+    assert sleeps == [scheduler.max_interval] * 3
+
+server.shutdown()
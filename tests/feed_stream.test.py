@@ -0,0 +1,109 @@
+import io
+import socket
+import threading
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import test_setup  # noqa
+
+# importing the module must not do any network I/O
+_socket = socket.socket
+socket.socket = None
+import ftrss  # noqa: E402
+
+socket.socket = _socket
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>Test</title>
+<entry><title>ECB hikes</title>
+<link rel="self" href="http://example.com/self"/>
+<link href="http://example.com/ecb"/>
+<published>2023-10-26T12:15:00Z</published>
+<content type="xhtml"><div xmlns="http://www.w3.org/1999/xhtml">Rates <b>up</b></div>
+</content></entry>
+</feed>"""
+
+assert list(ftrss.iter_entries(io.BytesIO(ATOM))) == [
+    {
+        "title": "ECB hikes",
+        "link": "http://example.com/ecb",
+        "published": "2023-10-26T12:15:00Z",
+        "summary": "Rates up",
+    }
+]
+
+
+def big_feed(n: int):
+    yield b'<?xml version="1.0"?><rss version="2.0"><channel><title>Big</title>'
+    for i in range(n):
+        yield (
+            f"<item><title>Article {i}</title><link>http://example.com/{i}</link>"
+            f"<pubDate>Mon, 30 Oct 2023 10:00:00 GMT</pubDate>"
+            f"<description>{'x' * 200}</description></item>"
+        ).encode()
+    yield b"</channel></rss>"
+
+
+class Stream(io.RawIOBase):
+    """File-like object generating the feed on the fly."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.buffer = b""
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        while not self.buffer:
+            self.buffer = next(self.chunks, None)
+            if self.buffer is None:
+                return 0
+        n = min(len(b), len(self.buffer))
+        b[:n], self.buffer = self.buffer[:n], self.buffer[n:]
+        return n
+
+
+def peak_memory(n: int) -> tuple[int, int]:
+    tracemalloc.start()
+    count = sum(1 for _ in ftrss.iter_entries(io.BufferedReader(Stream(big_feed(n)))))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return count, peak
+
+
+small, large = peak_memory(1_000), peak_memory(100_000)
+assert small[0] == 1_000 and large[0] == 100_000
+assert large[1] < 2 * small[1], (small, large)
+print(f"peak memory: {small[1] / 1e3:.0f}kB (1k items), {large[1] / 1e3:.0f}kB (100k)")
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.end_headers()
+        if self.path == "/atom.xml":
+            return self.wfile.write(ATOM)
+        for chunk in big_feed(10):
+            self.wfile.write(chunk)
+
+    def log_message(self, *args):
+        pass
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+
+base = f"http://127.0.0.1:{server.server_port}"
+entries = ftrss.scan(f"{base}/feed.rss")
+assert next(entries)["title"] == "Article 0"
+assert len(list(entries)) == 9
+
+# scan and FeedFetcher use the same parser, so they give the same entries
+with ftrss.FeedFetcher() as fetcher:
+    for path in ["/feed.rss", "/atom.xml"]:
+        fetched = fetcher.fetch_one(base + path)["entries"]
+        assert fetched == list(ftrss.scan(base + path)), path
+    assert sorted(e["link"] for e in fetcher.stream([base + "/feed.rss"])) == sorted(
+        f"http://example.com/{i}" for i in range(10)
+    )
+server.shutdown()
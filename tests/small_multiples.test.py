@@ -0,0 +1,78 @@
+import time
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from matplotlib.axes import Axes
+import test_setup  # noqa
+from mpl_bsic import apply_bsic_style, plot_line_collection, plot_small_multiples
+
+# many short series (e.g. 200 tenors or issuers over 60 days) per panel,
+# where the per-artist overhead of ax.plot is a large part of the time
+dates = pd.date_range("2023-01-01", periods=60, freq="B")
+rng = np.random.default_rng(0)
+panels = {
+    f"Panel {i}": pd.DataFrame(
+        rng.standard_normal((len(dates), 200)).cumsum(axis=0), index=dates
+    )
+    for i in range(4)
+}
+
+
+def per_line():
+    fig, axes = plt.subplots(2, 2, sharex=True, squeeze=False)
+    for ax, (title, data) in zip(axes.ravel(), panels.items()):
+        apply_bsic_style(fig, ax, title)
+        ax.plot(data)
+    return fig
+
+
+def collection():
+    fig, _ = plot_small_multiples(panels, ncols=2)
+    return fig
+
+
+def benchmark(name: str, make, repeat: int = 10):
+    timings = []
+    for _ in range(repeat):
+        timings.append(make())
+    print(f"{name}: {np.median(timings) * 1000:.1f}ms (median of {repeat})")
+
+
+def full_figure(make):
+    t0 = time.perf_counter()
+    fig = make()
+    fig.canvas.draw()
+    plt.close(fig)
+    return time.perf_counter() - t0
+
+
+def series_only(plot):
+    # time creating and drawing the series on a bare, already drawn Axes,
+    # so that figure, font and tick setup are not counted
+    fig, ax = plt.subplots(1, 1)
+    ax.set_axis_off()
+    fig.canvas.draw()
+    t0 = time.perf_counter()
+    plot(ax, panels["Panel 0"])
+    fig.canvas.draw()
+    plt.close(fig)
+    return time.perf_counter() - t0
+
+
+benchmark("full figure, per-line", lambda: full_figure(per_line))
+benchmark("full figure, collection", lambda: full_figure(collection))
+benchmark("series only, per-line", lambda: series_only(Axes.plot))
+benchmark("series only, collection", lambda: series_only(plot_line_collection))
+
+fig, axes = plot_small_multiples(
+    panels, ncols=3, aspect_ratio=0.5, time_unit="M", freq=1
+)
+assert len(axes[0, 0].collections) == 1
+assert not axes[1, 2].get_visible()
+
+# the panels above the empty cells keep their date labels
+fig.canvas.draw()
+for ax in [axes[0, 1], axes[0, 2], axes[1, 0]]:
+    assert any(label.get_visible() for label in ax.get_xticklabels())
+assert not any(label.get_visible() for label in axes[0, 0].get_xticklabels())
+plt.show()
@@ -0,0 +1,83 @@
+import os
+import shutil
+import tempfile
+import time
+import pandas as pd
+import pyarrow as pa
+import test_setup  # noqa
+import mpl_bsic
+from mpl_bsic import infer_date_format, preprocess_dataframe, read_timeseries_csv
+
+raw = pd.read_csv("tests/data/usyieldsdata.csv")
+assert infer_date_format(raw["Date"]) == "%m/%d/%Y"
+
+expected = raw.copy()
+preprocess_dataframe(expected)
+
+with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, "usyieldsdata.csv")
+    shutil.copy("tests/data/usyieldsdata.csv", path)
+
+    t0 = time.perf_counter()
+    data = read_timeseries_csv(path)
+    t1 = time.perf_counter()
+    cached = read_timeseries_csv(path, memory_map=True)
+    t2 = time.perf_counter()
+    print(f"parse: {(t1 - t0) * 1000:.2f}ms, cached: {(t2 - t1) * 1000:.2f}ms")
+
+    assert os.path.exists(path + ".feather")
+    assert (data.dtypes == "float32").all()
+    pd.testing.assert_frame_equal(data, cached)
+    pd.testing.assert_frame_equal(data, expected.astype("float32"))
+
+    # touching the file keeps the cache (same hash)
+    os.utime(path)
+    pd.testing.assert_frame_equal(read_timeseries_csv(path), data)
+
+    # a different date format invalidates it
+    ambiguous = os.path.join(tmp, "ambiguous.csv")
+    with open(ambiguous, "w") as f:
+        f.write("Date,US10Y\n1/2/2021,1.0\n3/4/2021,1.1\n")
+    assert read_timeseries_csv(ambiguous).index[0] == pd.Timestamp("2021-01-02")
+    dayfirst = read_timeseries_csv(ambiguous, date_format="%d/%m/%Y")
+    assert dayfirst.index[0] == pd.Timestamp("2021-02-01")
+
+    # changing the file invalidates it
+    with open(path, "a") as f:
+        f.write("12/31/2030,5.0,5.0,5.0\n")
+    updated = read_timeseries_csv(path, engine="pyarrow", cache="parquet")
+    assert len(updated) == len(data) + 1
+    assert updated.index[-1] == pd.Timestamp("2030-12-31")
+
+# a memory-mapped read of a large cache (more than one 64K-row chunk)
+# does not copy the columns into arrow memory
+with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, "large.csv")
+    n = 200_000
+    large = pd.DataFrame(
+        {"date": pd.date_range("2000-01-01", periods=n, freq="min"), "us10y": 1.0}
+    )
+    large.to_csv(path, index=False, date_format="%Y-%m-%d %H:%M:%S")
+    read_timeseries_csv(path)
+
+    allocated = pa.total_allocated_bytes()
+    mapped = read_timeseries_csv(path, memory_map=True)
+    assert len(mapped) == n
+    assert pa.total_allocated_bytes() - allocated < 1024
+
+# a read-only directory falls back to no cache (patched, tests may run as root)
+def read_only(*args):
+    raise PermissionError("read-only file system")
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, "usyieldsdata.csv")
+    shutil.copy("tests/data/usyieldsdata.csv", path)
+    write_cache, mpl_bsic._write_cache = mpl_bsic._write_cache, read_only
+    try:
+        pd.testing.assert_frame_equal(read_timeseries_csv(path), data)
+    finally:
+        mpl_bsic._write_cache = write_cache
+    assert not os.path.exists(path + ".feather.meta.json")
+
+print(data)